@@ -16,6 +16,8 @@
          oh mah gad
 """
 
+import numpy as np
+
 # Atomic weights for each respected atom
 element_weight = {
     'H': 1.0075,
@@ -223,6 +225,16 @@ covalent_radius = {
     'Cs': 2.35
 }
 
+# Lookup tables indexed by atomic number, element_weight lists elements in order of atomic number
+Z_TO_SYMBOL = np.array([""] + list(element_weight))
+SYMBOL_TO_Z = {symbol: z for z, symbol in enumerate(Z_TO_SYMBOL) if symbol}
+ELEMENT_WEIGHT = np.array([0.0] + list(element_weight.values()), dtype=np.float64)
+# Elements without a known radius get NaN so they never pass a bonding test
+COVALENT_RADIUS = np.array([covalent_radius.get(symbol, np.nan) for symbol in Z_TO_SYMBOL], dtype=np.float64)
+for _table in (Z_TO_SYMBOL, ELEMENT_WEIGHT, COVALENT_RADIUS):
+    _table.flags.writeable = False
+del _table
+
 HM2Hall = {
     #   1
     'P1': 'P 1',
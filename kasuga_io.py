@@ -9,14 +9,15 @@ def quit_with_error(error_message):
 
 
 def try_read(file_path):
-    file_contents = []
+    # One bulk read, decoding and line splitting both run in C on the whole buffer
+    return try_read_bytes(file_path).decode(errors="replace").splitlines()
+
+
+def try_read_bytes(file_path):
+    file_contents = b""
     try:
-        if "\\" not in file_path:  # Try to open file in the same directory
-            file = open(os.path.join(os.getcwd(), file_path), "r")
-        else:
-            file = open(file_path, "r")
-        file_contents = file.readlines()
-        file.close()
+        with open(os.fspath(file_path), "rb") as file:  # Relative paths resolve against cwd
+            file_contents = file.read()
     except OSError:
         quit_with_error(f'Can`t open: {file_path}')
     return file_contents
@@ -47,15 +47,45 @@ processing down the line (such as integration, IC and ISC calculations) is handl
 ⣼⠓⡌⡒⢌⣂⠣⡉⢆⡹⢯⣷⡏⠔⡨⢒⡉⠆⠥⢂⡱⢈⠆⡱⠠⢅⠓⡄⢣⠘⠤⣿⡇⢇⡹⢸⣷⢁⠎⡰⢁⠎⡰⢁⡒⢡⠊⡜⢠⠃⡥⠘⠤⣿⣳⡟⠤⡑⢃⠀⠀⠀
 """
 
+import math
 import os
+import re
+import sys
 import kasuga_io
 import numpy as np
 from copy import deepcopy
+try:
+    import numba
+except ImportError:  # numba is optional, plain Python code paths are used without it
+    numba = None
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, only BinaryCIF reading needs it
+    msgpack = None
 from constants import element_weight
 from constants import covalent_radius
+from constants import Z_TO_SYMBOL
+from constants import SYMBOL_TO_Z
+from constants import ELEMENT_WEIGHT
+from constants import COVALENT_RADIUS
 from constants import HM2Hall
 from constants import SymOpsHall
 
+# CIF number: value (group 1) with fraction digits (group 2 or 3) and either an exponent (group 4)
+# or a standard uncertainty in parentheses (group 5), e.g. "0.12345(7)". ASCII digits only, like _FLOAT_RE
+_NUMBER_RE = re.compile(r'^([+-]?(?:\d+(?:\.(\d*))?|\.(\d+)))(?:([eE][+-]?\d+)|\((\d+)\))?$', re.ASCII)
+# Single CIF token: either a '-quoted string (group 1) or a bare word (group 2)
+_TOKEN_RE = re.compile(r"'([^'\n]*)'|(\S+)")
+# Float CIF token short enough for its digits to fit a double mantissa exactly
+_FLOAT_RE = re.compile(r'^-?[0-9]{1,7}\.[0-9]{0,8}(?:\([0-9]{1,4}\))?$')
+# Fewer float tokens than this are converted one by one
+_FLOAT_BATCH_MIN = 8
+
+# BinaryCIF ByteArray type codes, all values are little-endian
+_BCIF_TYPES = {1: '<i1', 2: '<i2', 3: '<i4', 4: '<u1', 5: '<u2', 6: '<u4', 32: '<f4', 33: '<f8'}
+# Columns kept from a Gaussian orientation table: atomic number and Cartesian coordinates
+_GAUSSIAN_ATOM_DTYPE = np.dtype([('Z', 'i4'), ('x', 'f8'), ('y', 'f8'), ('z', 'f8')])
+
 
 def log_notation_to_float(s: str):
     if s.find("E") != -1:
@@ -67,6 +97,501 @@ def log_notation_to_float(s: str):
     return float(cut[0]) * (10 ** float(cut[1]))
 
 
+def _parse_cif_token(s: str):
+    """
+    Convert a single bare (unquoted) CIF token.
+    :param s: token without surrounding whitespace
+    :return: int, float or str value, "" for unknown (?) and inapplicable (.) values
+    """
+    if s == "?" or s == ".":
+        return ""
+    m = _NUMBER_RE.match(s)  # Token shape is classified in one pass, no conversion is attempted blindly
+    if m is None:
+        return s
+    mantissa, frac, lead_frac, exponent, unc = m.groups()
+    if unc is None:
+        return float(s) if exponent or "." in mantissa else int(s)
+    # Uncertainty digits are appended three times past the last digit of the value, 0.12(3) -> 0.12333
+    value = float(mantissa)
+    err = int(unc)
+    step = 10.0 ** len(unc)
+    divisor = 10.0 ** len(frac or lead_frac or "") * step
+    for _ in range(3):
+        value += err / divisor
+        divisor *= step
+    return value
+
+
+def _parse_cif_floats(buf, starts, ends, out):
+    """
+    Convert float CIF tokens with optional uncertainty in parentheses, packed into a single byte buffer.
+    Compiled with numba when it is available.
+    :param buf: ASCII characters of all tokens (np.uint8 array)
+    :param starts: offset of the first character of each token (np.int64 array)
+    :param ends: offset past the last character of each token (np.int64 array)
+    :param out: converted values (np.float64 array)
+    """
+    for k in range(starts.size):
+        p = starts[k]
+        end = ends[k]
+        negative = buf[p] == 45  # "-"
+        if negative:
+            p += 1
+        mantissa = 0
+        frac_len = 0
+        in_fraction = False
+        while p < end and buf[p] != 40:  # Digits up to "("
+            if buf[p] == 46:  # "."
+                in_fraction = True
+            else:
+                mantissa = mantissa * 10 + (int(buf[p]) - 48)
+                if in_fraction:
+                    frac_len += 1
+            p += 1
+        value = mantissa / 10.0 ** frac_len
+        if negative:
+            value = -value
+        if p < end:  # Uncertainty digits between "(" and ")", appended three times as in _parse_cif_token
+            unc = 0
+            unc_len = 0
+            p += 1
+            while buf[p] != 41:
+                unc = unc * 10 + (int(buf[p]) - 48)
+                unc_len += 1
+                p += 1
+            step = 10.0 ** unc_len
+            divisor = 10.0 ** frac_len * step
+            for _ in range(3):
+                value += unc / divisor
+                divisor *= step
+        out[k] = value
+
+
+if numba is not None:
+    _parse_cif_floats = numba.njit(cache=True)(_parse_cif_floats)
+
+
+def _parse_cif_float_batch(words):
+    """
+    Convert float CIF tokens (all matching _FLOAT_RE) with a single _parse_cif_floats call.
+    :param words: list of str tokens
+    :return: converted values (np.array)
+    """
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    ends = np.cumsum(lengths + 1) - 1
+    starts = ends - lengths
+    buf = np.frombuffer(" ".join(words).encode("ascii"), dtype=np.uint8)
+    out = np.empty(len(words), dtype=np.float64)
+    _parse_cif_floats(buf, starts, ends, out)
+    return out
+
+
+def _parse_cif_values(tokens):
+    """
+    Convert a sequence of CIF tokens. With numba, float tokens are collected and converted in one batch.
+    :param tokens: (quoted, bare) string pairs as matched by _TOKEN_RE
+    :return: list of converted values, quoted strings are kept verbatim
+    """
+    values = []
+    batch = []
+    for q, w in tokens:
+        if not w:
+            values.append(q)
+        elif numba is not None and _FLOAT_RE.match(w):
+            batch.append(len(values))
+            values.append(w)
+        else:
+            values.append(_parse_cif_token(w))
+    if len(batch) < _FLOAT_BATCH_MIN:
+        # Calling the kernel costs more than it saves on a handful of tokens
+        for k in batch:
+            values[k] = _parse_cif_token(values[k])
+    else:
+        for k, v in zip(batch, _parse_cif_float_batch([values[k] for k in batch]).tolist()):
+            values[k] = v
+    return values
+
+
+def _parse_cif_column(tokens):
+    """
+    Convert a single column of a CIF loop. Columns consisting only of floats are converted in one batch.
+    :param tokens: (quoted, bare) string pairs as matched by _TOKEN_RE
+    :return: np.array for purely numeric columns, list of converted values otherwise
+    """
+    words = [w for q, w in tokens]
+    if numba is not None and all(_FLOAT_RE.match(w) for w in words):
+        return _parse_cif_float_batch(words)
+    values = _parse_cif_values(tokens)
+    if all(isinstance(v, (int, float)) for v in values):
+        return np.array(values)  # int64 if every value is an integer, float64 otherwise
+    return values
+
+
+def _parse_text_field(lines, stripped, start_pos: int, file_path=""):
+    """
+    Read a ;-; text field of a CIF file. Lines keep their leading whitespace and each ends with a line break,
+    text right after the opening ";" is the first line of the value.
+    :param lines: raw lines of a CIF file
+    :param stripped: stripped lines of a CIF file
+    :param start_pos: index of the opening ";" line
+    :param file_path: path to the CIF file, used in error messages
+    :return: field value, index of the first line after the closing ";"
+    """
+    n_lines = len(stripped)
+    end = start_pos + 1
+    while end < n_lines and not stripped[end].startswith(";"):
+        end += 1
+    if end == n_lines:
+        kasuga_io.quit_with_error(f'Unterminated ;-; block after "{lines[start_pos - 1].strip()}"! '
+                                  f'Please verify "{file_path}" integrity.')
+    head = lines[start_pos].lstrip()[1:]
+    block = lines[start_pos + 1:end] if not head.strip() else [head] + lines[start_pos + 1:end]
+    # One join over the block instead of growing a string line by line
+    return "".join(line + "\n" for line in block), end + 1
+
+
+def _parse_loop_block(lines, stripped, start_pos: int, file_path=""):
+    """
+    Read a whole loop_ block of a CIF file.
+    :param lines: raw lines of a CIF file, only used for ;-; text fields
+    :param stripped: stripped lines of a CIF file
+    :param start_pos: index of the first loop tag, right after the "loop_" line
+    :param file_path: path to the CIF file, used in error messages
+    :return: loop columns as a {tag: column} dictionary, index of the first line after the block
+    """
+    loop_tags = []
+    n_lines = len(stripped)
+    i = start_pos
+    while i < n_lines and stripped[i].startswith("_"):
+        split = stripped[i].split(maxsplit=1)
+        loop_tags.append(sys.intern(split[0][1:]))
+        i += 1
+    data_start = i
+    loop_contents = []
+    while i < n_lines:
+        a = stripped[i]
+        if not a or a.startswith("_") or a.startswith("loop_"):  # Blank line, next tag or next loop
+            break
+        if a.startswith(";"):  # ;-; text field is a single value, possibly spanning blank lines
+            loop_contents += _TOKEN_RE.findall("\n".join(stripped[data_start:i]))
+            value, i = _parse_text_field(lines, stripped, i, file_path)
+            loop_contents.append((value, ""))
+            loop_contents += _TOKEN_RE.findall(stripped[i - 1][1:])  # Values may follow the closing ";"
+            data_start = i
+            continue
+        i += 1
+    # Runs of plain lines are tokenized at once so the token list is built in a few calls
+    loop_contents += _TOKEN_RE.findall("\n".join(stripped[data_start:i]))
+    n = len(loop_tags)
+    if n == 0 or len(loop_contents) % n != 0:
+        kasuga_io.quit_with_error(f'Faulty loop block around "{stripped[start_pos - 1]}" '
+                                  f'and "{stripped[i - 1]}"! '
+                                  f'Please verify "{file_path}" integrity.')
+    return {tag: _parse_cif_column(loop_contents[k::n]) for k, tag in enumerate(loop_tags)}, i
+
+
+def _parse_tag_block(lines, stripped, start_pos: int, file_path=""):
+    """
+    Read a single CIF tag together with its value.
+    :param lines: raw lines of a CIF file, only used for ;-; text blocks where leading whitespace is kept
+    :param stripped: stripped lines of a CIF file
+    :param start_pos: index of the tag line
+    :param file_path: path to the CIF file, used in error messages
+    :return: tag name, tag value, index of the first line after the value
+    """
+    split = stripped[start_pos].split(maxsplit=1)
+    n_lines = len(stripped)
+    tag_content = ""
+    next_pos = start_pos + 1
+    cd_block_encountered = False
+    if len(split) > 1:
+        tag_content = split[1]
+    elif start_pos + 1 >= n_lines:
+        pass  # Tag on the last line without a value, reported below
+    elif stripped[start_pos + 1].startswith(";"):
+        cd_block_encountered = True
+        tag_content, next_pos = _parse_text_field(lines, stripped, start_pos + 1, file_path)
+        if tag_content == "":
+            kasuga_io.quit_with_error(f'Faulty tag ;-; block encountered around "{lines[start_pos]}"! '
+                                      f'Please verify "{file_path}" integrity.')
+    else:
+        tag_content = stripped[start_pos + 1]
+        next_pos = start_pos + 2
+
+    if tag_content == "" or split[0] == "_":
+        kasuga_io.quit_with_error(f'Faulty CIF tag encountered around "{lines[start_pos]}"!'
+                                  f' Please verify "{file_path}" integrity.')
+    tag = sys.intern(split[0][1:])
+    if cd_block_encountered:
+        return tag, tag_content, next_pos
+    parsed = CifFile.parse_line(tag_content)
+    return tag, parsed[0] if len(parsed) == 1 else parsed, next_pos
+
+
+def _bcif_decode(data, encodings):
+    """
+    Decode a BinaryCIF column by undoing its encodings in reverse order.
+    :param data: encoded column data (bytes or np.array)
+    :param encodings: list of encoding dicts as stored in the file
+    :return: decoded column (np.array)
+    """
+    for e in reversed(encodings):
+        kind = e['kind']
+        if kind == "ByteArray":
+            data = np.frombuffer(data, dtype=_BCIF_TYPES[e['type']])
+        elif kind == "FixedPoint":
+            data = (data / e['factor']).astype(_BCIF_TYPES[e['srcType']])
+        elif kind == "IntervalQuantization":
+            step = (e['max'] - e['min']) / (e['numSteps'] - 1)
+            data = (e['min'] + data * step).astype(_BCIF_TYPES[e['srcType']])
+        elif kind == "RunLength":
+            data = np.repeat(data[0::2], data[1::2]).astype(_BCIF_TYPES[e['srcType']])
+        elif kind == "Delta":
+            data = data.astype(_BCIF_TYPES[e['srcType']])
+            if data.size:
+                data[0] += e['origin']
+            data = np.cumsum(data, dtype=data.dtype)
+        elif kind == "IntegerPacking":
+            # Values at the limits of the packed type continue into the next element
+            upper = np.iinfo(data.dtype).max
+            lower = np.iinfo(data.dtype).min
+            ends = np.flatnonzero((data != upper) & ((data != lower) | e['isUnsigned']))
+            starts = np.concatenate(([0], ends[:-1] + 1)).astype(np.intp)
+            data = np.add.reduceat(data.astype(np.int32), starts) if ends.size else np.zeros(0, dtype=np.int32)
+        elif kind == "StringArray":
+            offsets = _bcif_decode(e['offsets'], e['offsetEncoding'])
+            strings = np.array([e['stringData'][offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+                               + [""], dtype=object)
+            data = strings[_bcif_decode(data, e['dataEncoding'])]  # Index -1 picks "", a missing value
+        else:
+            kasuga_io.quit_with_error(f'Unsupported BinaryCIF encoding: {kind}')
+    return data
+
+
+def read_bcif(file_path=""):
+    """
+    Read atoms of the first data block of a BinaryCIF file, columns are decoded whole without text parsing.
+    Needs msgpack.
+    :param file_path: path to the BinaryCIF file
+    :return: Molecule
+    """
+    if msgpack is None:
+        kasuga_io.quit_with_error(f'msgpack is required to read BinaryCIF file {file_path}')
+    contents = msgpack.unpackb(kasuga_io.try_read_bytes(file_path), raw=False)
+    columns = {}
+    for category in contents['dataBlocks'][0]['categories']:
+        if category['name'].lstrip("_") == "atom_site":
+            columns = {c['name']: c['data'] for c in category['columns']}
+    for name in ("type_symbol", "Cartn_x", "Cartn_y", "Cartn_z"):
+        if name not in columns:
+            kasuga_io.quit_with_error(f'No atom_site.{name} column in BinaryCIF file {file_path}')
+    coords = np.stack([_bcif_decode(columns[name]['data'], columns[name]['encoding'])
+                       for name in ("Cartn_x", "Cartn_y", "Cartn_z")], axis=1)
+    symbols = _bcif_decode(columns['type_symbol']['data'], columns['type_symbol']['encoding'])
+    # mmCIF files write element symbols in upper case
+    symbols = [s[:1].upper() + s[1:].lower() for s in symbols]
+    return Molecule.from_array(symbols, coords)
+
+
+def _pairwise_d2(a: np.array, b: np.array):
+    """
+    Squared distances between two sets of points, |a - b|^2 = |a|^2 + |b|^2 - 2ab.
+    :param a: coordinates (np.array, (N,3))
+    :param b: coordinates (np.array, (M,3))
+    :return: squared distances (np.array, (N,M))
+    """
+    return (a * a).sum(1)[:, None] + (b * b).sum(1)[None, :] - 2 * a @ b.T
+
+
+def _bonded(d2: np.array, r: np.array, cutoff: float):
+    """
+    Bonding test for every pair, the same criterion as Atom.connected: |d - r| <= cutoff.
+    :param d2: squared distances (np.array, (N,M))
+    :param r: sums of covalent radii for every pair (np.array, (N,M))
+    :param cutoff: allowed deviation from the sum of covalent radii
+    :return: boolean mask (np.array, (N,M))
+    """
+    # Compared without square roots
+    return (d2 >= (r - cutoff) ** 2) & (d2 <= (r + cutoff) ** 2)
+
+
+def _rodrigues(axis: np.array, angle: float):
+    """
+    Rotation matrix for an arbitrary axis by Rodrigues' formula.
+    :param axis: rotation axis (np.array(3)), normalized internally
+    :param angle: angle of rotation (in degrees)
+    :return: 3x3 matrix rotating column vectors, row vectors are rotated as v @ matrix.T
+    """
+    k = axis / np.linalg.norm(axis)
+    angle_rad = np.deg2rad(angle)
+    c = np.cos(angle_rad)
+    s = np.sin(angle_rad)
+    cross = np.array([[0, -k[2], k[1]],
+                      [k[2], 0, -k[0]],
+                      [-k[1], k[0], 0]])
+    return c * np.eye(3) + s * cross + (1 - c) * np.outer(k, k)
+
+
+def _flood_fill(indptr, indices, start, excluded):
+    """
+    Breadth-first search over a graph in CSR form. Compiled with numba when it is available.
+    :param indptr: neighbours of point u are indices[indptr[u]:indptr[u + 1]] (np.array, (N+1,))
+    :param indices: concatenated neighbour lists (np.array)
+    :param start: index of the starting point
+    :param excluded: boolean mask of points that are neither visited nor passed through (np.array, (N,))
+    :return: boolean mask of visited points (np.array, (N,))
+    """
+    visited = np.zeros(excluded.shape[0], dtype=np.bool_)
+    queue = np.empty(excluded.shape[0], dtype=np.int64)
+    visited[start] = True
+    queue[0] = start
+    head = 0
+    tail = 1
+    while head < tail:
+        u = queue[head]
+        head += 1
+        for v in indices[indptr[u]:indptr[u + 1]]:
+            if not visited[v] and not excluded[v]:
+                visited[v] = True
+                queue[tail] = v
+                tail += 1
+    return visited
+
+
+if numba is not None:
+    _flood_fill = numba.njit(cache=True)(_flood_fill)
+
+# Parallel loop for the kernels below, a plain range when numba is not available
+_prange = numba.prange if numba is not None else range
+
+
+def _components(indptr, indices):
+    """
+    Label connected components of a graph in CSR form by min-label propagation.
+    Points are processed in parallel when compiled with numba.
+    :param indptr: neighbours of point u are indices[indptr[u]:indptr[u + 1]] (np.array, (N+1,))
+    :param indices: concatenated neighbour lists (np.array)
+    :return: component labels, the lowest point index of each component (np.array, (N,))
+    """
+    n = indptr.shape[0] - 1
+    labels = np.arange(n)
+    changed = True
+    while changed:
+        new_labels = labels.copy()
+        for u in _prange(n):
+            for v in indices[indptr[u]:indptr[u + 1]]:
+                if labels[v] < new_labels[u]:
+                    new_labels[u] = labels[v]
+        # Jump to the label of the label, shortens long chains
+        new_labels = new_labels[new_labels]
+        changed = (new_labels != labels).any()
+        labels = new_labels
+    return labels
+
+
+def _pair_bonded(coords, radii, cutoff, i, j):
+    # Same criterion as _bonded for a single pair of atoms
+    dx = coords[i, 0] - coords[j, 0]
+    dy = coords[i, 1] - coords[j, 1]
+    dz = coords[i, 2] - coords[j, 2]
+    d2 = dx * dx + dy * dy + dz * dz
+    r = radii[i] + radii[j]
+    return (r - cutoff) ** 2 <= d2 <= (r + cutoff) ** 2
+
+
+def _bonded_pairs(coords, radii, cutoff):
+    """
+    Pairwise bonding test without (N,N) storage, rows are processed in parallel when compiled with numba.
+    Same criterion as _bonded.
+    :param coords: coordinates (np.array, (N,3))
+    :param radii: covalent radius of every atom (np.array, (N,))
+    :param cutoff: allowed deviation from the sum of covalent radii
+    :return: bonded pairs as two index arrays (np.array, (E,)), first index always below the second one
+    """
+    n = coords.shape[0]
+    # Bonds of every row are counted first, so each row then writes its own slice of the output
+    counts = np.zeros(n, dtype=np.int64)
+    for i in _prange(n):
+        for j in range(i + 1, n):
+            if _pair_bonded(coords, radii, cutoff, i, j):
+                counts[i] += 1
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    first = np.empty(offsets[n], dtype=np.int64)
+    second = np.empty(offsets[n], dtype=np.int64)
+    for i in _prange(n):
+        k = offsets[i]
+        for j in range(i + 1, n):
+            if _pair_bonded(coords, radii, cutoff, i, j):
+                first[k] = i
+                second[k] = j
+                k += 1
+    return first, second
+
+
+def _csr_from_pairs(size, first, second):
+    """
+    Symmetric neighbour lists in CSR form from a list of undirected edges.
+    :param size: number of points
+    :param first: first point of every edge (np.array, (E,))
+    :param second: second point of every edge (np.array, (E,))
+    :return: indptr (np.array, (size+1,)), indices (np.array, (2E,)), sorted within each row
+    """
+    rows = np.concatenate((first, second)).astype(np.int64)
+    cols = np.concatenate((second, first)).astype(np.int64)
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, cols[order]
+
+
+def _symmetry_images(coords, rotations, translations):
+    """
+    Images of a coordinate block under every symmetry operation, operations are processed in parallel
+    when compiled with numba. Same result as coords @ rotations[s] + translations[s] for each s.
+    :param coords: row vectors (np.array, (N,3))
+    :param rotations: operation matrices acting on row vectors (np.array, (S,3,3))
+    :param translations: operation translations (np.array, (S,3))
+    :return: transformed coordinates (np.array, (S,N,3))
+    """
+    n_ops = rotations.shape[0]
+    n = coords.shape[0]
+    out = np.empty((n_ops, n, 3))
+    for s in _prange(n_ops):
+        for i in range(n):
+            for j in range(3):
+                out[s, i, j] = (coords[i, 0] * rotations[s, 0, j] + coords[i, 1] * rotations[s, 1, j]
+                                + coords[i, 2] * rotations[s, 2, j] + translations[s, j])
+    return out
+
+
+if numba is not None:
+    _components = numba.njit(parallel=True, cache=True)(_components)
+    _pair_bonded = numba.njit(cache=True)(_pair_bonded)
+    _bonded_pairs = numba.njit(parallel=True, cache=True)(_bonded_pairs)
+    _symmetry_images = numba.njit(parallel=True, cache=True)(_symmetry_images)
+else:
+    def _bonded_pairs(coords, radii, cutoff):
+        # Blocks of rows keep the float temporaries at about 2**18 pairs whatever the size
+        n = coords.shape[0]
+        step = max(1, (1 << 18) // max(n, 1))
+        first, second = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for start in range(0, n, step):
+            stop = min(start + step, n)
+            # Only columns from the block start on, pairs below the diagonal were seen by earlier blocks
+            d2 = ((coords[start:stop, None, :] - coords[None, start:, :]) ** 2).sum(2)
+            bonded = _bonded(d2, radii[start:stop, None] + radii[None, start:], cutoff)
+            bonded &= np.arange(start, stop)[:, None] < np.arange(start, n)[None, :]
+            i, j = np.nonzero(bonded)
+            first.append(i + start)
+            second.append(j + start)
+        return np.concatenate(first), np.concatenate(second)
+
+    def _symmetry_images(coords, rotations, translations):
+        # All operations at once as one broadcast product
+        return np.einsum('ni,sij->snj', coords, rotations) + translations[:, None, :]
+
+
 class Vector:
     """
     Base class containing coordinates represented as a np.array(3)
@@ -121,25 +646,9 @@ class Vector:
         """
         # normalize n just to be safe
         n = normal / np.linalg.norm(normal)
-        # plane equation coefficients
-        a = normal[0]
-        b = normal[1]
-        c = normal[2]
-        d = -1 * (a * point[0] + b * point[1] + c * point[2])
-        # distance between a point (our vector) and a mirror plane
-        distance = abs(a * self.coord[0] + b * self.coord[1] + c * self.coord[3] + d) / np.sqrt(
-            a ** 2 + b ** 2 + c ** 2)
-        # provided normal vector can either face the same direction as mirrored point or the opposite
-        test1 = self.coord + 2 * n * distance
-        test2 = self.coord - 2 * n * distance
-        distance_test1 = abs(a * test1[0] + b * test1[1] + c * test1[3] + d) / np.sqrt(a ** 2 + b ** 2 + c ** 2)
-        distance_test2 = abs(a * test2[0] + b * test2[1] + c * test2[3] + d) / np.sqrt(a ** 2 + b ** 2 + c ** 2)
-        if distance_test1 < distance_test2:
-            # same direction
-            self.coord = test1
-        else:
-            # opposite direction
-            self.coord = test2
+        # signed distance between a point (our vector) and a mirror plane, its sign picks the side
+        d = (self.coord - point) @ n
+        self.coord = self.coord - 2 * np.multiply.outer(d, n)
 
     def xyz_mirror(self, plane="xy", plane_point=np.zeros(3)):
         """
@@ -161,23 +670,10 @@ class Vector:
         Rotate Vector around arbitrary axis.
         :param angle: angle of rotation (in degrees)
         :param axis_point: point of origin for rotation axis (np.array) (np.array, [0,0,0] by default)
-        :param axis_vector:
+        :param axis_vector: direction of rotation axis (np.array), normalized internally
         """
-        axis_diff = self.coord - axis_point
-        axis_vector = axis_vector / np.linalg.norm(axis_vector)
-        angle_rad = np.deg2rad(angle)
-        matrix = np.zeros((3, 3))
-        matrix[0, 0] = np.cos(angle_rad) + axis_vector[0] ** 2 * (1 - np.cos(angle_rad))
-        matrix[0, 1] = axis_vector[0] * axis_vector[1] * (1 - np.cos(angle_rad)) - axis_vector[2] * np.sin(angle_rad)
-        matrix[0, 2] = axis_vector[0] * axis_vector[0] * (1 - np.cos(angle_rad)) + axis_vector[1] * np.sin(angle_rad)
-        matrix[1, 1] = np.cos(angle_rad) + axis_vector[1] ** 2 * (1 - np.cos(angle_rad))
-        matrix[1, 2] = axis_vector[1] * axis_vector[2] * (1 - np.cos(angle_rad)) - axis_vector[0] * np.sin(angle_rad)
-        matrix[2, 2] = np.cos(angle_rad) + axis_vector[2] ** 2 * (1 - np.cos(angle_rad))
-        matrix[1, 0] = matrix[0, 1]
-        matrix[2, 0] = matrix[0, 2]
-        axis_diff_rotated = np.matmul(axis_diff, matrix)
-        axis_translation = axis_diff - axis_diff_rotated
-        self.coord += axis_translation
+        matrix = _rodrigues(axis_vector, angle)
+        self.coord = (self.coord - axis_point) @ matrix.T + axis_point
 
     def improper_rotate(self, angle: float, axis_vector=np.zeros(3), point=np.zeros(3)):
         self.rotate(angle, axis_vector, point)
@@ -195,105 +691,246 @@ class Vector:
         delta = self.coord - v2.coord
         return np.linalg.norm(delta)
 
+    def distance2(self, v2):
+        # Squared distance, for comparisons against squared thresholds
+        delta = self.coord - v2.coord
+        return float(delta @ delta)
+
     def distance_rough(self, v2):
         delta = self.coord - v2.coord
         return max(float(abs(delta[0])), float(abs(delta[1])), float(abs(delta[2])))
 
 
 class ConnectivityGraph:
+    # Undirected graph stored as CSR neighbour lists, the dense adjacency matrix is only built on request
 
     def __init__(self, size):
         self.size = size
-        self.nodes = np.zeros((size, size))
+        self._nodes = None
+        self._csr = (np.zeros(size + 1, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+    @classmethod
+    def from_pairs(cls, size, first, second):
+        """
+        Build a graph straight from a list of edges, as returned by _bonded_pairs.
+        :param size: number of points
+        :param first: first point of every edge (np.array, (E,))
+        :param second: second point of every edge (np.array, (E,))
+        :return: new ConnectivityGraph
+        """
+        graph = cls(size)
+        graph._csr = _csr_from_pairs(size, first, second)
+        return graph
+
+    @property
+    def nodes(self):
+        # Dense (size,size) matrix for callers that index it, write into it through graph[i, j] only
+        if self._nodes is None:
+            indptr, indices = self._csr
+            self._nodes = np.zeros((self.size, self.size), dtype=np.bool_)
+            self._nodes[np.repeat(np.arange(self.size), np.diff(indptr)), indices] = True
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        # New matrix, neighbour lists are built again on first use
+        self._nodes = nodes
+        self._csr = None
 
     def __getitem__(self, item):
         return self.nodes[item]
 
     def __setitem__(self, key, value):
         self.nodes[key] = value
+        self._csr = None
 
-    def flood_fill_search(self, startpoint: int, excluded):
-        if excluded is None:
-            excluded = []
-        inside = np.zeros(self.size)  # points that are connected to the starting one
-        checked = np.zeros(self.size)  # points that we have already checked
-        while True:
-            for i in range(self.size):
-                if self.nodes[startpoint, i] == 1 or self.nodes[i, startpoint] == 1:
-                    if i not in excluded and inside[i] != 1:
-                        inside[i] = 1  # include all points that are connected to current start point
-            checked[startpoint] = 1  # so, we've checked current start point
-            count_inside = 0
-            count_checked = 0
-            for i in range(self.size):
-                if checked[i] == 1:
-                    count_checked += 1
-                if inside[i] == 1:
-                    count_inside += 1
-                if checked[i] != 0 and inside[i] == 1:
-                    startpoint = i
-                    break
-            if count_inside == count_checked:
-                return inside
+    def neighbours(self):
+        """
+        Neighbour lists of the graph in CSR form, either direction of a bond counts.
+        Cached until the dense matrix is assigned or written to.
+        :return: indptr (np.array, (size+1,)), indices (np.array)
+        """
+        if self._csr is None:
+            adjacency = self._nodes.astype(np.bool_, copy=False)
+            first, second = np.nonzero(adjacency | adjacency.T)
+            upper = first < second
+            self._csr = _csr_from_pairs(self.size, first[upper], second[upper])
+        return self._csr
+
+    def components(self):
+        """
+        Split the graph into connected components.
+        :return: component labels (np.array, (size,)), points share a label when connected
+        """
+        indptr, indices = self.neighbours()
+        return _components(indptr, indices)
+
+    def flood_fill_search(self, startpoint: int, excluded=None):
+        """
+        Find all points connected to the starting one.
+        :param startpoint: index of the starting point
+        :param excluded: index or indices of points that are neither included nor passed through
+        :return: boolean mask (np.array, (size,)) of connected points, starting point included
+        """
+        excluded_mask = np.zeros(self.size, dtype=np.bool_)
+        if excluded is not None:
+            excluded_mask[np.asarray(excluded, dtype=np.int64).reshape(-1)] = True
+        indptr, indices = self.neighbours()
+        return _flood_fill(indptr, indices, startpoint, excluded_mask)
 
     def subsets_connected(self, subset_one: np.ndarray, subset_two: np.ndarray):
-        for i1 in range(subset_one.size):
-            for i2 in range(subset_two.size):
-                if self.nodes[i1, i2] == 1 or self.nodes[i2, i1] == 1:
-                    return True
-        return False
+        """
+        Check whether two sets of points share a point or are linked by at least one edge.
+        :param subset_one: boolean mask of the first set (np.array, (size,))
+        :param subset_two: boolean mask of the second set (np.array, (size,))
+        :return: bool
+        """
+        subset_one = np.asarray(subset_one, dtype=np.bool_)
+        subset_two = np.asarray(subset_two, dtype=np.bool_)
+        if (subset_one & subset_two).any():
+            return True
+        # Any edge going from the first set into the second, O(edges) over the cached neighbour lists
+        indptr, indices = self.neighbours()
+        rows = np.repeat(np.arange(self.size), np.diff(indptr))
+        return bool((subset_one[rows] & subset_two[indices]).any())
 
 
 class Atom(Vector):
 
     def assign_weight(self):
-        if self.symbol in element_weight:
-            self.weight = element_weight[self.symbol]
+        if self.symbol in SYMBOL_TO_Z:
+            self.Z = SYMBOL_TO_Z[self.symbol]
+            self.weight = float(ELEMENT_WEIGHT[self.Z])
         else:
             kasuga_io.quit_with_error(f'Unrecognized {self.symbol} atom encountered!')
 
-    def __init__(self, symbol="", v=Vector()):
+    def __init__(self, symbol="", v=None):
+        super().__init__()
         self.weight = 0.0  # Atomic weight
         self.charge = 0.0
-        self.coord = v
-        self.symbol = ""  # Chemical symbol of an atom
-        super().__init__()
+        if v is not None:  # Own flat (3,) copy, never shared with the caller or other atoms
+            self.coord = np.array(v.coord if isinstance(v, Vector) else v, dtype=np.float64).reshape(3)
+        self.symbol = symbol  # Chemical symbol of an atom
+        self.Z = 0  # Atomic number, set together with weight
         if symbol != "":
             self.assign_weight()
 
     def __eq__(self, other):
-        distance = np.linalg.norm(self.coord - other.coord)
-        if distance < 0.001 and self.symbol == other.symbol:
-            return True
-        else:
-            return False
+        return self.symbol == other.symbol and self.distance2(other) < 0.001 ** 2
 
     def __ne__(self, other):
-        distance = np.linalg.norm(self.coord - other.coord)
-        if distance < 0.001 and self.symbol == other.symbol:
-            return False
-        else:
-            return True
+        return not self == other
 
     def connected(self, b, simplified=False, cutoff=0.025):
         vdw_distance = covalent_radius[self.symbol] + covalent_radius[b.symbol]
         if simplified:
             d = Vector.distance_rough(self, b)
-        else:
-            d = Vector.distance(self, b)
-        if abs(d - vdw_distance) <= cutoff:
-            return True
-        else:
-            return False
+            return abs(d - vdw_distance) <= cutoff
+        # |d - r| <= cutoff compared without square roots
+        d2 = self.distance2(b)
+        return (vdw_distance - cutoff) ** 2 <= d2 <= (vdw_distance + cutoff) ** 2
+
+
+class _AtomView(Atom):
+    """
+    Atom backed by one row of Molecule arrays, reading and writing its attributes goes straight to the molecule.
+    Views are invalidated when atoms are added to or removed from the molecule.
+    """
+
+    def __init__(self, molecule, index: int):
+        self._molecule = molecule
+        self._index = index
+
+    @property
+    def coord(self):
+        return self._molecule._coords[self._index]
+
+    @coord.setter
+    def coord(self, value):
+        self._molecule._coords[self._index] = value
+
+    @property
+    def symbol(self):
+        return self._molecule._symbols[self._index]
+
+    @symbol.setter
+    def symbol(self, value):
+        self._molecule._symbols[self._index] = value
+        self._molecule._Z[self._index] = SYMBOL_TO_Z.get(value, 0)
+        self._molecule._connectivity_dirty = True
+
+    @property
+    def Z(self):
+        return int(self._molecule._Z[self._index])
+
+    @property
+    def weight(self):
+        return float(ELEMENT_WEIGHT[self._molecule._Z[self._index]])
+
+    @property
+    def charge(self):
+        return float(self._molecule._charges[self._index])
+
+    @charge.setter
+    def charge(self, value):
+        self._molecule._charges[self._index] = value
+
+    def assign_weight(self):
+        # Atomic number and weight follow the symbol, only the check is left
+        if self.symbol not in SYMBOL_TO_Z:
+            kasuga_io.quit_with_error(f'Unrecognized {self.symbol} atom encountered!')
+
+
+class _AtomList:
+    """
+    List-like access to the atoms of a Molecule, items are Atom views into the molecule arrays.
+    """
+
+    def __init__(self, molecule):
+        self._molecule = molecule
+
+    def __len__(self):
+        return len(self._molecule._symbols)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [_AtomView(self._molecule, i) for i in range(len(self))[item]]
+        item = range(len(self))[item]  # Negative indices and IndexError as for a list
+        return _AtomView(self._molecule, item)
+
+    def __setitem__(self, key, atom):
+        key = range(len(self))[key]
+        self._molecule._symbols[key] = atom.symbol
+        self._molecule._Z[key] = SYMBOL_TO_Z.get(atom.symbol, 0)
+        self._molecule._coords[key] = atom.coord
+        self._molecule._charges[key] = atom.charge
+        self._molecule._connectivity_dirty = True
+
+    def __iter__(self):
+        return (_AtomView(self._molecule, i) for i in range(len(self)))
+
+    def append(self, atom: Atom):
+        self._molecule._append([atom.symbol], [atom.coord], [atom.charge])
+
+    def extend(self, atoms):
+        atoms = list(atoms)
+        self._molecule._append([a.symbol for a in atoms], [a.coord for a in atoms], [a.charge for a in atoms])
 
 
 class Molecule:
 
     def __init__(self):
-        self.atoms = []
+        # Atoms are stored as parallel arrays, self.atoms gives Atom views into them
+        self._symbols = np.empty(0, dtype=object)
+        self._Z = np.empty(0, dtype=np.intp)
+        self._coords = np.empty((0, 3))
+        self._charges = np.empty(0)
         self.mass_center = None
         self.molecular_formula = None
         self.connectivity_graph = None
+        self._connectivity_dirty = True  # Atoms were added or removed since the graph was built
+        self._connectivity_cutoff = None  # Cutoff the graph was built with
+        self._radii = None  # (atomic numbers, per-atom covalent radii) of the last build
         self.inertia_eigenvectors = None
         self.inertia_eigenvalues = None
         self.inertia_vector_x, self.inertia_vector_y, self.inertia_vector_z = None, None, None
@@ -302,284 +939,233 @@ class Molecule:
         self.quadrupole_moment = np.zeros((3, 3))
         self.point_group = ""
 
+    @property
+    def atoms(self):
+        return _AtomList(self)
+
+    @atoms.setter
+    def atoms(self, atoms):
+        # Read everything first, the atoms may be views into this very molecule
+        atoms = [(a.symbol, np.array(a.coord, dtype=np.float64), a.charge) for a in atoms]
+        self._keep(np.zeros(len(self._symbols), dtype=np.bool_))
+        if atoms:
+            symbols, coords, charges = zip(*atoms)
+            self._append(symbols, coords, charges)
+
+    def _append(self, symbols, coords, charges=None):
+        # Append atoms given as arrays, every symbol has to be a known element
+        symbols = [str(s) for s in symbols]
+        for s in symbols:
+            if s not in SYMBOL_TO_Z:
+                kasuga_io.quit_with_error(f'Unrecognized {s} atom encountered!')
+        coords = np.asarray(coords, dtype=np.float64).reshape(len(symbols), 3)
+        charges = np.zeros(len(symbols)) if charges is None else np.asarray(charges, dtype=np.float64)
+        self._symbols = np.concatenate((self._symbols, np.array(symbols, dtype=object)))
+        self._Z = np.concatenate((self._Z, [SYMBOL_TO_Z[s] for s in symbols])).astype(np.intp)
+        self._coords = np.concatenate((self._coords, coords))
+        self._charges = np.concatenate((self._charges, charges))
+        self._connectivity_dirty = True
+
+    def _keep(self, mask: np.array):
+        # Drop atoms not selected by a boolean mask
+        self._symbols = self._symbols[mask]
+        self._Z = self._Z[mask]
+        self._coords = self._coords[mask]
+        self._charges = self._charges[mask]
+        self._connectivity_dirty = True
+
+    def _subset(self, mask: np.array):
+        # New molecule made of copies of the atoms selected by a boolean mask
+        molecule = Molecule()
+        molecule._append(self._symbols[mask], self._coords[mask], self._charges[mask])
+        return molecule
+
+    def _moved(self, coords: np.array):
+        # New molecule with the same atoms placed at new (N,3) coordinates
+        molecule = Molecule()
+        molecule._append(self._symbols, coords, self._charges)
+        return molecule
+
+    def _apply(self, operation, *args):
+        # Vector operations work row-wise, so all coordinates are moved at once as a single (N,3) Vector
+        v = Vector()
+        v.coord = self._coords
+        operation(v, *args)
+        self._coords = np.array(v.coord, dtype=np.float64).reshape(-1, 3)
+
     def __add__(self, other):
-        for i in other.atoms:
-            self.atoms.append(i)
+        self._append(other._symbols, other._coords, other._charges)
         self.rebuild_connectivity()
+        return self
 
     def __sub__(self, other):
-        for_deletion = []
-        for i1 in other.atoms:
-            for num, i2 in enumerate(self.atoms):
-                if i1 == i2:
-                    for_deletion.append(self.atoms[num])
-        for i1 in for_deletion:
-            if i1 in self.atoms:
-                self.atoms.remove(i1)
+        # Atoms are matched by symbol and coordinates rounded to 0.001, same tolerance as Atom.__eq__
+        other_keys = set(zip(other._symbols, map(tuple, np.round(other._coords, 3))))
+        keys = zip(self._symbols, map(tuple, np.round(self._coords, 3)))
+        self._keep(np.fromiter((k not in other_keys for k in keys), dtype=np.bool_, count=len(self._symbols)))
         self.rebuild_connectivity()
+        return self
 
     def __eq__(self, other):
-        diff = 0.0
         # Simple tests first to potentially save the hassle
-        if self.get_molecular_formula() != self.get_molecular_formula():
+        if self.get_molecular_formula() != other.get_molecular_formula():
             return False
         # For symmetry cloned molecules it's safe to assume that the order of atoms is still the same
         # But generally it's not always the case, especially if molecules originate from different sources
-        for i1 in range(len(self.atoms)):
-            current_min = 1000
-            for i2 in range(len(other.atoms)):
-                # We look for the closest atom with the same symbol
-                if self.atoms[i1].symbol == other.atoms[i2].symbol:
-                    current_diff = self.atoms[i1].distance(other.atoms[i2])
-                    if current_diff < current_min:
-                        current_min = current_diff
-            diff += current_min
-        if diff < 0.05:
-            return True
-        else:
-            return False
+        d2 = _pairwise_d2(self._coords, other._coords)
+        # We look for the closest atom with the same symbol
+        d2[self._Z[:, None] != other._Z[None, :]] = np.inf
+        diff = np.sqrt(np.maximum(d2.min(axis=1, initial=np.inf), 0.0)).sum()
+        return bool(diff < 0.05)
 
     def __ne__(self, other):
-        diff = 0.0
-        if self.get_molecular_formula() != self.get_molecular_formula():
-            return False
-        for i1 in range(len(self.atoms)):
-            current_min = 1000
-            for i2 in range(len(other.atoms)):
-                if self.atoms[i1].symbol == other.atoms[i2].symbol:
-                    current_diff = self.atoms[i1].distance(other.atoms[i2])
-                    if current_diff < current_min:
-                        current_min = current_diff
-            diff += current_min
-        if diff < 0.05:
-            if diff < 0.05:
-                return False
-            else:
-                return True
+        return not self == other
 
     def __getitem__(self, item):
-        if len(item) >= 2:
-            return self.atoms[item[0]].coord[item[1]]
-        else:
-            return self.atoms[item].coord
+        return self._coords[item]
 
     def __setitem__(self, key, value):
-        if len(key) >= 2:
-            self.atoms[key[0]].coord[key[1]] = value
-        else:
-            self.atoms[key].coord = value
+        self._coords[key] = value
 
     def translate(self, v: Vector):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].coord += v
+        self._coords += v.coord if isinstance(v, Vector) else v
 
     def transform(self, matrix: np.array):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].transform(matrix)
+        self._apply(Vector.transform, matrix)
 
     def invert(self, inv_coord=np.zeros(3)):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].invert(inv_coord)
+        self._apply(Vector.invert, inv_coord)
 
     def mirror(self, normal=np.array([1, 0, 0]), point=np.zeros(3)):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].mirror(normal, point)
+        self._apply(Vector.mirror, normal, point)
 
     def xyz_mirror(self, plane="xy", plane_point=np.zeros(3)):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].xyz_mirror(plane, plane_point)
+        self._apply(Vector.xyz_mirror, plane, plane_point)
 
     def rotate(self, angle: float, axis_vector: np.array, axis_point=np.zeros(3)):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].rotate(angle, axis_vector, axis_point)
+        self._apply(Vector.rotate, angle, axis_vector, axis_point)
 
     def improper_rotate(self, angle: float, axis_vector=np.zeros(3), point=np.zeros(3)):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].improper_rotate(angle, axis_vector, point)
+        self._apply(Vector.improper_rotate, angle, axis_vector, point)
 
     def screw_axis(self, angle: float, axis_vector=np.zeros(3), point=np.zeros(3), translation_vector=np.zeros(3)):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].screw_axis(angle, axis_vector, point, translation_vector)
+        self._apply(Vector.screw_axis, angle, axis_vector, point, translation_vector)
 
     def glide_plane(self, normal=np.array([1, 0, 0]), point=np.zeros(3), translation_vector=np.zeros(3)):
-        for i in range(len(self.atoms) - 1):
-            self.atoms[i].glide_plane(normal, point, translation_vector)
+        self._apply(Vector.glide_plane, normal, point, translation_vector)
 
     def add_atom(self, atom: str, v: Vector):
         if atom in element_weight:
-            new_atom = Atom(symbol=atom)
-            new_atom.coord = v
-            self.atoms.append(new_atom)
+            self._append([atom], [v.coord if isinstance(v, Vector) else v])
         else:
             kasuga_io.quit_with_error(f'add_atom method error: unknown atom {atom}')
 
     def rebuild_connectivity(self):
-        self.connectivity_graph = ConnectivityGraph(len(self.atoms))
-        for n1, a1 in enumerate(self.atoms):
-            for n2, a2 in enumerate(self.atoms):
-                if a1.connected(a2):
-                    self.connectivity_graph.nodes[n1, n2] = 1
+        self.connectivity_graph = None
+        self._connectivity_dirty = True
+        self._update_connectivity()
 
     def separate_molecules(self):
-        checked = []
-        vectors = []
-        flag = True
-        vector = None
-        while flag:
-            for i in range(self.connectivity_graph.size - 1):
-                checked.append(False)
-            for i in range(self.connectivity_graph.size - 1):
-                if not checked:
-                    vector = self.connectivity_graph.flood_fill_search(startpoint=i)
-                    break
-            for i in range(self.connectivity_graph.size - 1):
-                if vector[i] == 1:
-                    checked[i] = True
-                else:
-                    checked[i] = False
-            vectors.append(vector)
-            check_count = 0
-            for i in range(self.connectivity_graph.size - 1):
-                if checked:
-                    check_count += 1
-            if check_count == self.connectivity_graph.size:
-                flag = False
+        self._update_connectivity()
+        labels = self.connectivity_graph.components()
         molecules = []
-        for v in vectors:
-            new_mol = Molecule()
-            for i in range(self.connectivity_graph.size - 1):
-                if v[i] == 1:
-                    new_mol.atoms.append(self.atoms[i])
-            molecules.append(new_mol)
+        for label in np.unique(labels):
+            molecules.append(self._subset(labels == label))
         if len(molecules) == 1:
             return None
         return molecules
 
-    def is_connected(self, other):
-        for i1 in self.atoms:
-            for i2 in other.atoms:
-                if i1.connected(i2):
-                    return True
-        return False
+    def is_connected(self, other, cutoff=0.025):
+        d2 = _pairwise_d2(self._coords, other._coords)
+        r = COVALENT_RADIUS[self._Z][:, None] + COVALENT_RADIUS[other._Z][None, :]
+        return bool(_bonded(d2, r, cutoff).any())
+
+    def as_array(self):
+        """
+        Export atoms as arrays for vectorized processing.
+        :return: atomic symbols (list), coordinates (np.array, (N,3)), atomic numbers (np.array, (N,))
+        """
+        return list(self._symbols), self._coords.copy(), self._Z.copy()
+
+    @classmethod
+    def from_array(cls, symbols, coords: np.array):
+        """
+        Build a molecule from arrays of atomic symbols and coordinates.
+        :param symbols: atomic symbols (any sequence of str)
+        :param coords: coordinates (np.array, (N,3))
+        :return: new Molecule
+        """
+        molecule = cls()
+        molecule._append(symbols, coords)
+        return molecule
 
     def get_mass_center(self):
-        if self.mass_center is None:
-            self.mass_center = Vector()
-        mass = 0.0
-        mass_vector = np.zeros((3, 1))
-        for atom in self.atoms:
-            mass += element_weight[atom.symbol]
-            mass_vector += atom.coord * element_weight[atom.symbol]
-        self.mass_center = mass_vector / mass
+        weights = ELEMENT_WEIGHT[self._Z]
+        self.mass_center = weights @ self._coords / weights.sum()
         return self.mass_center
 
     def get_molecular_formula(self):
-        if self.molecular_formula is None:
-            self.molecular_formula = ""
-        atom_list = []
-        count_list = []
-        for i, atom in enumerate(self.atoms):
-            if atom.symbol not in atom_list:
-                atom_list.append(atom.symbol)
-        atom_list.sort()
-        for i1, atom_in_formula in enumerate(atom_list):
-            count_list.append(0)
-            for i2, atom_in_list in enumerate(self.atoms):
-                if atom_in_formula == atom_in_list:
-                    count_list[i1] += 1
-        result = ""
-        for i, atom in enumerate(atom_list):
-            result += (atom + str(count_list[i]))
-        self.molecular_formula = result
+        # Elements in alphabetical order, each followed by its count
+        symbols, counts = np.unique(self._symbols.astype(str), return_counts=True)
+        self.molecular_formula = "".join(f'{s}{c}' for s, c in zip(symbols, counts))
         return self.molecular_formula
 
-    def get_connectivity_matrix(self):
-        if self.connectivity_graph is None:
-            self.connectivity_graph = ConnectivityGraph(len(self.atoms))
-        for i1 in range(len(self.atoms)):
-            for i2 in range(i1, len(self.atoms)):
-                if self.atoms[i1].connected(self.atoms[i2]):
-                    self.connectivity_graph.nodes[i1, i2] = 1
-                    self.connectivity_graph.nodes[i2, i1] = 1
-        return self.connectivity_graph.nodes
+    def _update_connectivity(self, cutoff=0.025):
+        # Conformational changes keep bonds, so the graph is only rebuilt after the set of atoms changes
+        if (not self._connectivity_dirty and cutoff == self._connectivity_cutoff
+                and self.connectivity_graph is not None and self.connectivity_graph.size == len(self._Z)):
+            return self.connectivity_graph
+        z = self._Z
+        if self._radii is None or self._radii[0] != z.tobytes():
+            self._radii = (z.tobytes(), COVALENT_RADIUS[z])
+        # Bonds go straight from the edge list into CSR, no (N,N) matrix is built on the way
+        first, second = _bonded_pairs(self._coords, self._radii[1], cutoff)
+        self.connectivity_graph = ConnectivityGraph.from_pairs(len(z), first, second)
+        self._connectivity_dirty = False
+        self._connectivity_cutoff = cutoff
+        return self.connectivity_graph
+
+    def get_connectivity_matrix(self, cutoff=0.025):
+        return self._update_connectivity(cutoff).nodes
 
     def get_inertia_vectors(self):
-        if self.inertia_eigenvalues is None or self.inertia_eigenvectors is None:
-            self.inertia_eigenvectors = np.zeros((3, 3))
-            self.inertia_eigenvalues = np.zeros(3)
         # First, we translate origin to mass center
-        if self.mass_center is None:
-            mass_center = self.get_mass_center()
-        else:
-            mass_center = self.mass_center
-        atoms_mc_system = []
-        for a in self.atoms:
-            new_a = Atom()
-            new_a.coord = a.coord - mass_center
-            new_a.symbol = a.symbol
-            atoms_mc_system.append(new_a)
-        # Calculate inertia tensor
-        for a in atoms_mc_system:
-            # xx
-            self.inertia_eigenvectors[0, 0] += element_weight[a.symbol] * (a.coord[1, 0] ** 2 + a.coord[2, 0] ** 2)
-            # xy
-            self.inertia_eigenvectors[0, 1] += -1 * element_weight[a.symbol] * a.coord[0, 0] * a.coord[1, 0]
-            # xz
-            self.inertia_eigenvectors[0, 2] += -1 * element_weight[a.symbol] * a.coord[0, 0] * a.coord[2, 0]
-            # yy
-            self.inertia_eigenvectors[1, 1] += element_weight[a.symbol] * (a.coord[0, 0] ** 2 + a.coord[2, 0] ** 2)
-            # yz
-            self.inertia_eigenvectors[1, 2] += -1 * element_weight[a.symbol] * a.coord[1, 0] * a.coord[2, 0]
-            # zz
-            self.inertia_eigenvectors[2, 2] += element_weight[a.symbol] * (a.coord[0, 0] ** 2 + a.coord[1, 0] ** 2)
-        self.inertia_eigenvectors[1, 0] = self.inertia_eigenvectors[0, 1]
-        self.inertia_eigenvectors[2, 0] = self.inertia_eigenvectors[0, 2]
-        self.inertia_eigenvectors[2, 1] = self.inertia_eigenvectors[1, 2]
-        # Calculate eigenvalues and eigenvectors of the inertia tensor
-        self.inertia_eigenvalues, self.inertia_eigenvectors = np.linalg.eig(self.inertia_eigenvectors)
+        weights = ELEMENT_WEIGHT[self._Z]
+        r = self._coords - self.get_mass_center()
+        # Inertia tensor: sum of w * ((r.r) * I - r x r) over atoms
+        tensor = np.einsum('n,n->', weights, (r * r).sum(1)) * np.eye(3) - np.einsum('n,ni,nj->ij', weights, r, r)
+        # Tensor is symmetric, eigenvalues come out real
+        eigenvalues, eigenvectors = np.linalg.eigh(tensor)
         # Assign eigenvectors to Cartesian axis: highest for Z, lowest for X
-        internal_e = self.inertia_eigenvalues
-        if self.inertia_vector_x is None or self.inertia_vector_y is None or self.inertia_vector_z is None:
-            self.inertia_vector_x = Vector()
-            self.inertia_vector_y = Vector()
-            self.inertia_vector_z = Vector()
-        for i in range(3):
-            index = np.where(internal_e == internal_e.max())
-            if self.inertia_vector_z.coord != np.zeros(3):
-                self.inertia_vector_z = (self.inertia_eigenvalues[index[0] - 1:index[0], :] /
-                                         np.linalg.norm(self.inertia_eigenvalues[index[0] - 1:index[0], :]))
-            elif self.inertia_vector_y.coord != np.zeros(3):
-                self.inertia_vector_y.coord = (self.inertia_eigenvalues[index[0] - 1:index[0], :] /
-                                               np.linalg.norm(self.inertia_eigenvalues[index[0] - 1:index[0], :]))
-            elif self.inertia_vector_x.coord != np.zeros(3):
-                self.inertia_vector_x.coord = (self.inertia_eigenvalues[index[0] - 1:index[0], :] /
-                                               np.linalg.norm(self.inertia_eigenvalues[index[0] - 1:index[0], :]))
-            internal_e[index[0], 0] = -1.0
+        order = np.argsort(eigenvalues)
+        self.inertia_eigenvalues = eigenvalues[order]
+        self.inertia_eigenvectors = eigenvectors[:, order]
+        # Eigenvectors come with arbitrary signs, each axis is turned towards the side where the weighted
+        # third moment of the atoms is positive, so every copy of a molecule gets the same frame
+        p = r @ self.inertia_eigenvectors
+        skew = weights @ p ** 3
+        signs = np.sign(skew)
+        for k in np.nonzero(np.abs(skew) <= 1e-8 * (weights @ np.abs(p) ** 3))[0]:
+            # Atoms are symmetric along this axis, the first one off the perpendicular plane decides
+            off = np.nonzero(np.abs(p[:, k]) > 1e-6 * np.abs(p[:, k]).max(initial=0.0))[0]
+            signs[k] = np.sign(p[off[0], k]) if off.size else 1.0
+        self.inertia_eigenvectors = self.inertia_eigenvectors * signs
+        self.inertia_vector_x, self.inertia_vector_y, self.inertia_vector_z = self.inertia_eigenvectors.T
         return self.inertia_vector_x, self.inertia_vector_y, self.inertia_vector_z
 
     def match_rotation_to(self, other):
         # Extract principal axes for each molecule
         # Static stays in place, rotated is transformed
-        rotated_x, rotated_y, rotated_z = self.get_inertia_vectors()
-        static_x, static_y, static_z = other.get_inertia_vectors()
-        # Since the vectors are stored in ((3,1)) shape we need transpose them first
-        rotated_x = np.transpose(rotated_x)
-        rotated_y = np.transpose(rotated_y)
-        rotated_z = np.transpose(rotated_z)
-        static_x = np.transpose(static_x)
-        static_y = np.transpose(static_y)
-        static_z = np.transpose(static_z)
-        # Create matrices that rotate standard coordinate system 0 to molecule's principal axes
-        rot_mat_rotated = np.array([[rotated_x], [rotated_y], [rotated_z]])
-        rot_mat_static = np.array([[static_x], [static_y], [static_z]])
-        # Combine two rotations: Rotated -> 0  (inverted 0 -> Rotated) and 0 -> Static
-        final_rotation = np.matmul(np.linalg.inv(rot_mat_rotated), rot_mat_static)
+        rotated_x, rotated_y, _ = self.get_inertia_vectors()
+        static_x, static_y, _ = other.get_inertia_vectors()
+        # Rows are the principal axes, z is rebuilt from x and y so both frames are right-handed
+        rot_mat_rotated = np.vstack((rotated_x, rotated_y, np.cross(rotated_x, rotated_y)))
+        rot_mat_static = np.vstack((static_x, static_y, np.cross(static_x, static_y)))
+        # Combine two rotations: Rotated -> 0 (transpose is the inverse for orthonormal axes) and 0 -> Static
+        final_rotation = rot_mat_rotated.T @ rot_mat_static
         # We translate Rotated to 0 system, perform rotation, and translate it back
         mass_center = self.get_mass_center()
-        for i in range(len(self.atoms)):
-            self.atoms[i].coord -= mass_center
-            self.atoms[i].coord = np.transpose(np.matmul(np.transpose(self.atoms[i].coord), final_rotation))
-            self.atoms[i].coord += mass_center
+        self._coords = (self._coords - mass_center) @ final_rotation + mass_center
 
     def read_charges(self, file_path=""):
         file_contents = kasuga_io.try_read(file_path)
@@ -587,48 +1173,52 @@ class Molecule:
             line_split = line.split()
             self.atoms[num].charge = float(line_split[4])
 
+    def _index_mask(self, *indices):
+        mask = np.zeros(len(self._symbols), dtype=np.bool_)
+        mask[list(indices)] = True
+        return mask
+
     def change_bond(self, bond: tuple, delta: float):
-        first_fragment = self.connectivity_graph.flood_fill_search(bond[0], (bond[1]))
-        second_fragment = self.connectivity_graph.flood_fill_search(bond[1], (bond[0]))
-        translation_vector = self.atoms[bond[0]].coord - self.atoms[bond[1]].coord
-        translation_vector = np.linalg.norm(translation_vector)
-        if self.connectivity_graph.subsets_connected(first_fragment, second_fragment):
-            self.atoms[bond[0]].coord += delta * translation_vector / 2
-            self.atoms[bond[1]].coord -= delta * translation_vector / 2
-        else:
-            for i in first_fragment:
-                self.atoms[i].coord += delta * translation_vector / 2
-            for i in second_fragment:
-                self.atoms[i].coord -= delta * translation_vector / 2
+        self._update_connectivity()  # Builds the graph if atoms changed, free otherwise
+        first_fragment = self.connectivity_graph.flood_fill_search(bond[0], bond[1])
+        second_fragment = self.connectivity_graph.flood_fill_search(bond[1], bond[0])
+        coords = self._coords  # Fragments are moved in place
+        translation_vector = coords[bond[0]] - coords[bond[1]]
+        translation_vector /= np.linalg.norm(translation_vector)  # Unit vector along the bond
+        # The bond itself always links the fragments, only another path between them means a ring
+        if self.connectivity_graph.subsets_connected(first_fragment & ~self._index_mask(bond[0]),
+                                                     second_fragment & ~self._index_mask(bond[1])):
+            first_fragment = self._index_mask(bond[0])
+            second_fragment = self._index_mask(bond[1])
+        coords[first_fragment] += delta * translation_vector / 2
+        coords[second_fragment] -= delta * translation_vector / 2
 
     def change_angle(self, angle: tuple, delta: float):
-        first_fragment = self.connectivity_graph.flood_fill_search(angle[0], (angle[1]))
-        second_fragment = self.connectivity_graph.flood_fill_search(angle[2], (angle[1]))
-        v1 = self.atoms[angle[0]].coord - self.atoms[angle[1]].coord
-        v2 = self.atoms[angle[2]].coord - self.atoms[angle[1]].coord
-        # noinspection PyUnreachableCode
-        rotation_vector = np.cross(v1, v2)
+        self._update_connectivity()
+        first_fragment = self.connectivity_graph.flood_fill_search(angle[0], angle[1])
+        second_fragment = self.connectivity_graph.flood_fill_search(angle[2], angle[1])
+        coords = self._coords  # Fragments are moved in place
+        pivot = coords[angle[1]].copy()
+        rotation_vector = np.cross(coords[angle[0]] - pivot, coords[angle[2]] - pivot)
         if self.connectivity_graph.subsets_connected(first_fragment, second_fragment):
-            self.atoms[angle[0]].rotate(delta / 2, rotation_vector, self.atoms[angle[1]])
-            self.atoms[angle[0]].rotate(-1 * delta / 2, rotation_vector, self.atoms[angle[1]])
-        else:
-            for i in first_fragment:
-                self.atoms[i].rotate(delta / 2, rotation_vector, self.atoms[angle[1]])
-            for i in second_fragment:
-                self.atoms[i].rotate(-1 * delta / 2, rotation_vector, self.atoms[angle[1]])
+            first_fragment = self._index_mask(angle[0])
+            second_fragment = self._index_mask(angle[2])
+        # Rotating both sides away from each other around the normal of the angle plane opens it by delta
+        coords[first_fragment] = (coords[first_fragment] - pivot) @ _rodrigues(rotation_vector, -delta / 2).T + pivot
+        coords[second_fragment] = (coords[second_fragment] - pivot) @ _rodrigues(rotation_vector, delta / 2).T + pivot
 
     def change_dihedral(self, dihedral: tuple, delta: float):
+        self._update_connectivity()
         f_fragment = self.connectivity_graph.flood_fill_search(dihedral[0], (dihedral[1], dihedral[2], dihedral[3]))
         s_fragment = self.connectivity_graph.flood_fill_search(dihedral[3], (dihedral[0], dihedral[1], dihedral[2]))
-        rotation_vector = self.atoms[dihedral[1]].coord - self.atoms[dihedral[2]].coord
+        coords = self._coords  # Fragments are moved in place
+        pivot = coords[dihedral[1]].copy()
+        rotation_vector = pivot - coords[dihedral[2]]
         if self.connectivity_graph.subsets_connected(f_fragment, s_fragment):
-            self.atoms[dihedral[0]].rotate(delta / 2, rotation_vector, self.atoms[dihedral[1]])
-            self.atoms[dihedral[3]].rotate(-1 * delta / 2, rotation_vector, self.atoms[dihedral[1]])
-        else:
-            for i in f_fragment:
-                self.atoms[i].rotate(delta / 2, rotation_vector, self.atoms[dihedral[1]])
-            for i in s_fragment:
-                self.atoms[i].rotate(-1 * delta / 2, rotation_vector, self.atoms[dihedral[1]])
+            f_fragment = self._index_mask(dihedral[0])
+            s_fragment = self._index_mask(dihedral[3])
+        coords[f_fragment] = (coords[f_fragment] - pivot) @ _rodrigues(rotation_vector, delta / 2).T + pivot
+        coords[s_fragment] = (coords[s_fragment] - pivot) @ _rodrigues(rotation_vector, -delta / 2).T + pivot
 
 
 class GaussianFile:
@@ -677,18 +1267,18 @@ class GaussianFile:
         def get_link0(start_pos: int, lines):
             for i1 in range(start_pos, len(lines)):
                 a = lines[i1].strip()
-                if a[0] == "-":
+                if a.startswith("-"):
                     return i1 + 1
-                else:
+                elif a:  # Blank lines carry no instructions
                     splitted = a.split("=")
                     self.link0_instructions[splitted[0].strip()[1:]] = splitted[1].strip()
 
         def get_calculation_instructions(start_pos: int, lines):
             for i1 in range(start_pos, len(lines)):
                 a = lines[i1].strip()
-                if a[0] == "-":
+                if a.startswith("-"):
                     return i1 + 1
-                else:
+                elif a:
                     self.calculation_instructions.append(a)
 
         extracted_lines = self.file_raw_contents[self.__start_end[0]: self.__start_end[1]]
@@ -700,17 +1290,33 @@ class GaussianFile:
 
     def link101(self):
         extracted_lines = self.file_raw_contents[self.__start_end[0]: self.__start_end[1]]
-        self.calculation_title = extracted_lines[1].strip()
-        for num, s in enumerate(extracted_lines):
-            if s[0] == " ":
-                return None
-            new_atom = Atom()
-            line = s.split()
-            new_atom.symbol = line[0]
-            new_atom.coord[0] = float(line[1])
-            new_atom.coord[1] = float(line[2])
-            new_atom.coord[2] = float(line[3])
-            self.geometries[0].atoms.append(new_atom)
+        stripped = [line.strip() for line in extracted_lines]
+        # Title card sits between the first two lines made of dashes
+        dashes = [num for num, line in enumerate(stripped) if line and not line.strip("-")]
+        if len(dashes) > 1:
+            self.calculation_title = " ".join(stripped[dashes[0] + 1: dashes[1]])
+        # Atom table starts right after the charge and multiplicity line and runs until the first blank line
+        start = next((num + 1 for num, line in enumerate(stripped)
+                      if line.startswith("Charge =") and "Multiplicity =" in line), None)
+        if start is None:
+            return None
+        end = next((num for num in range(start, len(stripped)) if not stripped[num]), len(stripped))
+        if end == start:
+            return None
+        try:
+            table = np.loadtxt(stripped[start:end], dtype=str, ndmin=2)
+            # Coordinates are the last three columns, an optional freeze flag may precede them
+            coords = table[:, -3:].astype(np.float64)
+        except ValueError:
+            return None  # Not a Cartesian table, e.g. Z-matrix input
+        if table.shape[1] < 4:
+            return None
+        # Symbols may carry decorations like C(Fragment=1) or be given as atomic numbers
+        symbols = [Z_TO_SYMBOL[int(a)] if a.isdigit() else re.match(r'[A-Za-z]*', a).group().capitalize()
+                   for a in table[:, 0]]
+        if not self.geometries:
+            self.geometries.append(Molecule())
+        self.geometries[0]._append(symbols, coords)
 
     def link103(self):
         extracted_lines = self.file_raw_contents[self.__start_end[0]: self.__start_end[1]]
@@ -726,20 +1332,14 @@ class GaussianFile:
             new_molecule.symmetrized = True
         a = extracted_lines[4].split()
         new_molecule.point_group = a[1]
-        i = 0
-        check_line = extracted_lines[i + 10]
-        while check_line.strip()[0] != "-":
-            a = check_line.split()
-            atom_index = int(a[1])
-            new_atom = Atom()
-            new_atom.symbol = list(element_weight)[atom_index]
-            new_atom.assign_weight()
-            new_atom.coord[0] = float(a[3])
-            new_atom.coord[1] = float(a[4])
-            new_atom.coord[2] = float(a[5])
-            new_molecule.atoms.append(new_atom)
-            i += 1
-            check_line = extracted_lines[i + 10]
+        # Atom table starts 10 lines in and is closed by a line of dashes
+        end = next((num for num in range(10, len(extracted_lines)) if extracted_lines[num].lstrip().startswith("-")),
+                   len(extracted_lines))
+        table = np.loadtxt(extracted_lines[10:end], usecols=(1, 3, 4, 5), ndmin=1, dtype=_GAUSSIAN_ATOM_DTYPE)
+        if ((table['Z'] < 1) | (table['Z'] >= Z_TO_SYMBOL.size)).any():
+            kasuga_io.quit_with_error(f'Unrecognized atomic number in standard orientation of {self.path}')
+        coords = np.stack((table['x'], table['y'], table['z']), axis=1)
+        new_molecule._append(Z_TO_SYMBOL[table['Z']], coords)
         self.geometries.append(new_molecule)
 
     def link502(self):
@@ -841,15 +1441,17 @@ class GaussianFile:
                 self.geometries[len(self.geometries) - 1].quadrupole_moment[2, 1] = (
                     self.geometries[len(self.geometries) - 1].quadrupole_moment)[2, 1]
 
+    # Parsers for each link, called as handler(self) with __start_end set to the link's output block
+    links_dict = {
+        "L1": link1,
+        "L101": link101,
+        "L103": link103,
+        "L202": link202,
+        "L502": link502,
+        "L601": link601,
+    }
+
     def read(self, file_path=""):
-        links_dict = {
-            "L1": self.link1(),
-            "L101": self.link101(),
-            "L103": self.link103(),
-            "L202": self.link202(),
-            "L502": self.link502(),
-            "L601": self.link601(),
-        }
         self.path = file_path
         self.file_raw_contents = kasuga_io.try_read(file_path)
         self.__start_end = [0, 0]
@@ -863,20 +1465,21 @@ class GaussianFile:
                 self.link1()
                 break
         self.__start_end = [0, 0]
+        detected_link = ""
         for num, line in enumerate(self.file_raw_contents):
             split_line = line.split()
-            detected_link = ""
-            if split_line[0] == "(Enter":
+            if split_line and split_line[0] == "(Enter":
                 self.__start_end[0] = num
                 link_split1 = split_line[1].split("/")
                 link_split2 = link_split1[len(link_split1) - 1].split(".")
-                detected_link = link_split2[0]
-                detected_link[0] = "L"
+                detected_link = "L" + link_split2[0][1:]
             if "Leave" in split_line and "Link" in split_line:
                 self.__start_end[1] = num
-                if detected_link in links_dict:
-                    result = links_dict[detected_link]()
-                    self.__start_end = [0, 0]
+                handler = self.links_dict.get(detected_link)
+                if handler is not None:
+                    handler(self)
+                self.__start_end = [0, 0]
+                detected_link = ""
 
 
 class GaussianCube:
@@ -930,9 +1533,8 @@ class CifFile:
     # Parser and processor for .cif files according to CIF v1.1 standard
 
     def __init__(self):
-        self.transform_matrix = None
         self.tags = {}  # Single fields from CIF
-        self.loops = []  # Looped fields from CIF
+        self.loops = []  # Looped fields from CIF, each loop stored as {tag: column}
         # Cell parameters
         self.cell_length_a = float
         self.cell_length_b = float
@@ -944,17 +1546,20 @@ class CifFile:
         self.translation_a = Vector()
         self.translation_b = Vector()
         self.translation_c = Vector()
-        # Transformation matrix from abc-system to Cartesian
-        self.coord_transform_matrix = np.zeros((3, 3))
+        # Transformation matrix from abc-system to Cartesian, applied to column vectors
+        self.transform_matrix = np.zeros((3, 3))
+        self.transform_matrix_inv = np.zeros((3, 3))  # Cartesian to abc-system, computed once per cell
         # Asymmetric unit of a primitive cell
         self.as_unit = Molecule()
         self.as_molecules = []
         self.xyz_eq = []
+        # Parsed symmetry operations stacked for _symmetry_images, act on row vectors of abc-coordinates
+        self.symmetry_rotations = np.zeros((0, 3, 3))
+        self.symmetry_translations = np.zeros((0, 3))
 
     @staticmethod
     def parse_xyz_eq(eq: list):
-        for num, s in enumerate(eq):
-            eq[num] = s.strip()
+        eq = [s.strip() for s in eq]  # Equations come straight from SymOpsHall, which must stay intact
         transformation_matrix = np.zeros((3, 3))
         translation_vector = np.zeros(3)
         c = ["x", "y", "z"]
@@ -977,141 +1582,32 @@ class CifFile:
 
     @staticmethod
     def parse_line(line):
-        line = line.strip()
-        if line == "?" or line == ".":
-            return ""
-        if line[0] == "'" and line[len(line) - 1] == "'":
-            return line[1:len(line) - 1]
-        split = line.split()
-        out = []
-        for s in split:
-            if s[0] == "'" and s[len(s) - 1] == "'":
-                out.append(s[1:len(s) - 1])
-                continue
-            else:
-                try:
-                    pre = int(s)
-                    out.append(pre)
-                except ValueError:
-                    try:
-                        pre = float(s)
-                        out.append(pre)
-                    except ValueError:
-                        if isinstance(s, str):
-                            out.append(s)
-                        elif "(" in s and ")" in s:
-                            temp = float(s[0:s.find("(")])
-                            for i in range(3):
-                                l1 = len(s[s.find(".") + 1: s.find("(")])
-                                l2 = len(s[s.find("(") + 1: s.find(")")])
-                                temp += float(s[s.find("(") + 1:s.find(")")]) * 10 ** (-1 * (l1 + (i + 1) * l2))
-                            out.append(temp)
-                        else:
-                            kasuga_io.quit_with_error(f'Unrecognized variable in "{line}"!')
-        if len(out) == 1:
-            return out[0]
-        else:
-            return out
+        # Quoted strings are kept verbatim, bare tokens are converted
+        return _parse_cif_values(_TOKEN_RE.findall(line))
 
     def read_raw(self, file_path):
-        file_contents = []
-        parsed_loop = []
-        loop_tags = []
-        loop_contents = []
-        file_contents = kasuga_io.try_read(file_path)
-
-        for i in range(len(file_contents)):  # Initial survey for any Shelxl data to be expunged
-            if "_shelx_res_file" in file_contents[i]:
-                file_contents = file_contents[:i]  # Slice away everything below first Shelxl tag
-                break
-
-        in_loop = False
-        loop_parsed = False
-
-        for index in range(len(file_contents)):
-            if "loop_" in file_contents[index]:
-                in_loop = True
-                parsed_loop = []
-                loop_tags = []
-                loop_contents = []
-                continue
-
-            if in_loop and loop_parsed:
-                if file_contents[index].strip() == "":
-                    in_loop = False
-                    loop_parsed = False
-                    continue
-                else:
-                    continue
-
-            if in_loop:
-                start_index = index
-                reading_tags = True
-
-                for i in range(start_index, len(file_contents)):
-                    if file_contents[i].strip()[0] == "_":
-                        split = file_contents[i].split()
-                        loop_tags.append(split[0][1:])
-                    else:
-                        reading_tags = False
-                        start_index = i
-                        break
-
-                if not reading_tags:
-                    for i in range(start_index, len(file_contents)):
-                        if file_contents[i].strip() == "":
-                            if len(loop_contents) % len(loop_tags) != 0:
-                                kasuga_io.quit_with_error(f'Faulty loop block around "{file_contents[index]}" '
-                                                          f'and "{file_contents[i]}"! '
-                                                          f'Please verify "{file_path}" integrity.')
-                            else:
-                                for i1 in range(len(loop_contents) // len(loop_tags)):
-                                    d = {}
-                                    for i2 in range(len(loop_tags)):
-                                        d[loop_tags[i2]] = loop_contents[i1 + i2]
-                                    parsed_loop.append(d)
-                                self.loops.append(parsed_loop)
-                                loop_parsed = True
-                                break
-                        else:
-                            loop_pre_contents = self.parse_line(file_contents[i])
-                            if isinstance(loop_pre_contents, list):
-                                for i2 in loop_pre_contents:
-                                    loop_contents.append(i2)
-                            else:
-                                loop_contents.append(loop_pre_contents)
-
-            if file_contents[index][0] == "_" and not in_loop:
-                split = file_contents[index].split()
-                tag_content = ""
-
-                cd_block_encountered = False
-                if len(split) > 1:
-                    for i in range(1, len(split)):
-                        tag_content += split[i]
-                elif ";" in file_contents[index + 1]:
-                    cd_block_encountered = True
-                    ind = index + 2
-                    if file_contents[ind] == ";":
-                        kasuga_io.quit_with_error(f'Faulty tag ;-; block encountered around "{file_contents[index]}"! '
-                                                  f'Please verify "{file_path}" integrity.')
-                    else:
-                        for i in range(ind, len(file_contents)):
-                            if ";" in file_contents[i]:
-                                break
-                            else:
-                                tag_content += file_contents[i]
-                else:
-                    tag_content = file_contents[index + 1]
-
-                if tag_content == "" or split[0] == "_":
-                    kasuga_io.quit_with_error(f'Faulty CIF tag encountered around "{file_contents[index]}"!'
-                                              f' Please verify "{file_path}" integrity.')
-                else:
-                    if cd_block_encountered:
-                        self.tags[split[0][1:]] = tag_content
-                    else:
-                        self.tags[split[0][1:]] = self.parse_line(tag_content)
+        self.tags = {}  # Start from a clean state so re-reading does not merge files
+        self.loops = []
+        raw = kasuga_io.try_read_bytes(file_path)
+        cut = raw.find(b"\n_shelx_res_file")  # Any Shelxl data is expunged before splitting into lines
+        if cut != -1:
+            raw = raw[:cut]  # Slice away everything below first Shelxl tag
+        file_contents = raw.decode(errors="replace").splitlines()
+        del raw  # Only the split lines are kept alive while parsing
+        stripped = [line.strip() for line in file_contents]
+
+        # Every block parser consumes its own lines, so each line is visited exactly once
+        index = 0
+        n_lines = len(file_contents)
+        while index < n_lines:
+            if stripped[index] == "loop_":
+                rows, index = _parse_loop_block(file_contents, stripped, index + 1, file_path)
+                self.loops.append(rows)
+            elif stripped[index].startswith("_"):
+                tag, value, index = _parse_tag_block(file_contents, stripped, index, file_path)
+                self.tags[tag] = value
+            else:
+                index += 1
 
     def parse_raw(self):
         # Primitive cell dimensions
@@ -1125,67 +1621,84 @@ class CifFile:
         self.cell_angle_gamma = self.tags['cell_angle_gamma']  # Between a and b
 
         # Generate transformation matrix from abc to Cartesian
-        cosa = np.cos(np.deg2rad(self.cell_angle_alpha))
-        cosb = np.cos(np.deg2rad(self.cell_angle_beta))
-        cosg = np.cos(np.deg2rad(self.cell_angle_gamma))
-        sing = np.sin(np.deg2rad(self.cell_angle_gamma))
-        volume = np.sqrt(1.0 - cosa ** 2.0 - cosb ** 2.0 - cosg ** 2.0 + 2.0 * cosa * cosb * cosg)
+        # Plain float math on scalars, only the final matrix becomes an array
+        cosa, cosb, cosg = (math.cos(math.radians(angle)) for angle in
+                            (self.cell_angle_alpha, self.cell_angle_beta, self.cell_angle_gamma))
+        sing = math.sin(math.radians(self.cell_angle_gamma))
+        volume = math.sqrt(1.0 - cosa ** 2.0 - cosb ** 2.0 - cosg ** 2.0 + 2.0 * cosa * cosb * cosg)
         self.transform_matrix = np.array([[self.cell_length_a, self.cell_length_b * cosg, self.cell_length_c * cosb],
                                          [0, self.cell_length_b * sing, self.cell_length_c *
                                           (cosa - cosb * cosg) / sing],
                                          [0, 0, self.cell_length_c * volume / sing]])
+        # The matrix is upper triangular, so its inverse has a closed form and needs no LAPACK call
+        (m00, m01, m02), (_, m11, m12), (_, _, m22) = self.transform_matrix.tolist()
+        self.transform_matrix_inv = np.array([[1.0 / m00, -m01 / (m00 * m11),
+                                               (m01 * m12 - m02 * m11) / (m00 * m11 * m22)],
+                                              [0, 1.0 / m11, -m12 / (m11 * m22)],
+                                              [0, 0, 1.0 / m22]])
 
         # Translation vectors in cartesian coordinates
         # Most of the symmetry operations are performed in the abc-system for the sake of simplicity
         # Yet, for some processing down the line we might need cartesian vectors as well
-        self.translation_a.coord[0] = self.cell_length_a  # We assume that X-axis is aligned with a-axis
-        self.translation_b.coord = np.matmul(np.array([0, 1, 0]), self.coord_transform_matrix)
-        self.translation_c.coord = np.matmul(np.array([0, 0, 1]), self.coord_transform_matrix)
+        # We assume that X-axis is aligned with a-axis, cell vectors are the columns of the matrix
+        self.translation_a.coord, self.translation_b.coord, self.translation_c.coord = self.transform_matrix.T.copy()
 
         # Extract fractional coordinates from CIF loops
         found_as = False
         for i1 in range(len(self.loops)):
-            if "atom_site_label" in self.loops[i1][0]:
+            if "atom_site_label" in self.loops[i1]:
                 if found_as:
                     kasuga_io.quit_with_error(f'Duplicated asymmetric units in CIF file!')
                 else:
                     found_as = True
-                for i2 in range(len(self.loops[i1])):
-                    a = Atom()
-                    a.symbol = self.loops[i1][i2]['atom_site_type_symbol']
-                    a.assign_weight()
-                    a.coord[0] = self.loops[i1][i2]['atom_site_fract_x']
-                    a.coord[1] = self.loops[i1][i2]['atom_site_fract_y']
-                    a.coord[2] = self.loops[i1][i2]['atom_site_fract_z']
-                    self.as_unit.atoms.append(a)
-        self.xyz_eq = SymOpsHall[HM2Hall[self.tags["_symmetry_space_group_name_H-M"]]]
+                # Loops are stored column-wise, so the whole asymmetric unit is appended in one go
+                coords = np.column_stack([np.asarray(self.loops[i1][tag], dtype=np.float64) for tag in
+                                          ('atom_site_fract_x', 'atom_site_fract_y', 'atom_site_fract_z')])
+                self.as_unit._append(self.loops[i1]['atom_site_type_symbol'], coords)
+        self.xyz_eq = SymOpsHall[HM2Hall[self.tags["symmetry_space_group_name_H-M"].replace(" ", "")]]
+        operations = [self.parse_xyz_eq(s) for s in self.xyz_eq]
+        self.symmetry_translations = np.array([vector for vector, _ in operations]).reshape(-1, 3)
+        self.symmetry_rotations = np.array([matrix for _, matrix in operations]).reshape(-1, 3, 3)
+
+    def abc_to_cart(self, coords_abc: np.array):
+        """
+        Convert fractional coordinates to Cartesian in one batched product.
+        :param coords_abc: fractional coordinates (np.array, (3,) or (N,3))
+        :return: Cartesian coordinates (np.array, same shape)
+        """
+        return np.asarray(coords_abc, dtype=np.float64) @ self.transform_matrix.T
+
+    def cart_to_abc(self, coords_cart: np.array):
+        """
+        Convert Cartesian coordinates to fractional with the inverse matrix cached by parse_raw.
+        :param coords_cart: Cartesian coordinates (np.array, (3,) or (N,3))
+        :return: fractional coordinates (np.array, same shape)
+        """
+        return np.asarray(coords_cart, dtype=np.float64) @ self.transform_matrix_inv.T
 
     def build_as_molecules(self):
         mol_to_add = []
         self.as_unit.rebuild_connectivity()
         self.as_molecules = self.as_unit.separate_molecules()
-        for s in self.xyz_eq:
-            vector, matrix = self.parse_xyz_eq(s)
-            for mol in self.as_molecules:
-                new_molecule = Molecule()
-                new_molecule.atoms = mol.atoms
-                for i in range(len(new_molecule.atoms) - 1):
-                    new_molecule.atoms[i] = np.matmul(new_molecule.atoms[i], matrix)
-                    new_molecule.atoms[i] += vector
-                    if mol != new_molecule:
-                        flag = False
-                        for i2 in range(len(self.as_molecules) - 1):
-                            if new_molecule.is_connected(self.as_molecules[i2]):
-                                flag = True
-                        if flag:
+        if self.as_molecules is None:  # Asymmetric unit is a single molecule
+            self.as_molecules = [self.as_unit]
+        for mol in self.as_molecules:
+            # Every symmetry operation is applied to the whole (N,3) block of row vectors in one call
+            images = _symmetry_images(mol._coords, self.symmetry_rotations, self.symmetry_translations)
+            for coords in images:
+                new_molecule = mol._moved(coords)
+                if mol != new_molecule:
+                    for other in self.as_molecules:
+                        if new_molecule.is_connected(other):
                             mol_to_add.append(new_molecule)
+                            break
         for m in mol_to_add:
             self.as_molecules.append(m)
         whole = Molecule()
         for m in self.as_molecules:
             whole += m
         whole.rebuild_connectivity()
-        self.as_molecules = whole.separate_molecules()
+        self.as_molecules = whole.separate_molecules() or [whole]
 
 
 # Cluster is an array of molecules either natively generated from an associated CifFile or appended through other means
@@ -1217,14 +1730,9 @@ class Cluster:
         self.molecules = self.cif.as_molecules
 
     def build_primitive_cell(self):
-        new_molecule = Molecule()
         for m in self.molecules:
-            for xyz in self.cif.xyz_eq:
-                vector, matrix = CifFile.parse_xyz_eq(xyz)
-                new_molecule.atoms = m.atoms
-                for a in range(len(new_molecule.atoms) - 1):
-                    new_molecule.atoms[a] = np.matmul(new_molecule.atoms[a], matrix)
-                    new_molecule.atoms[a] += vector
+            for coords in _symmetry_images(m._coords, self.cif.symmetry_rotations, self.cif.symmetry_translations):
+                new_molecule = m._moved(coords)
                 flag = True
                 for m1 in self.molecules:
                     if new_molecule == m1:
@@ -1249,10 +1757,10 @@ class Cluster:
             self.molecules.remove(d)
 
     def transform_to_cartesian(self):
-        for num1, mol in enumerate(self.molecules):
-            for num2, a in enumerate(mol.atoms):
-                mol.atoms.coord[num2] = np.matmul(a.coord, self.cif.transform_matrix)
-            self.molecules[num1].atoms = mol.atoms
+        # Whole coordinate blocks are converted at once, distances change so bonds have to be rebuilt
+        for mol in self.molecules:
+            mol._coords = self.cif.abc_to_cart(mol._coords)
+            mol._connectivity_dirty = True
 
     def multiply(self, direction="x", count=1):
         translation_vector = Vector()
@@ -1269,10 +1777,6 @@ class Cluster:
         cloned_molecules = []
         for mol in self.molecules:
             for i in range(count):
-                new_molecule = Molecule()
-                new_molecule.atoms = mol.atoms
-                t = Vector()
-                t.coord = i * translation_vector.coord
-                new_molecule.translate(t)
+                new_molecule = mol._moved(mol._coords + i * translation_vector.coord)
                 if not self.molecule_is_in_cluster(new_molecule) and new_molecule not in cloned_molecules:
                     cloned_molecules.append(new_molecule)
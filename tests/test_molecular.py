@@ -0,0 +1,55 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import molecular  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def random_rotation(seed):
+    # Proper rotation from the QR decomposition of a random matrix
+    q, _ = np.linalg.qr(np.random.default_rng(seed).normal(size=(3, 3)))
+    return q * np.sign(np.linalg.det(q))
+
+
+class MatchRotationTest(unittest.TestCase):
+
+    molecules = {
+        "asymmetric": (["C", "O", "N", "H", "H", "Cl"],
+                       [[0.0, 0.0, 0.0], [1.2, 0.1, 0.0], [-0.7, 1.1, 0.2],
+                        [-0.5, -0.9, 0.3], [0.3, 0.2, 1.0], [2.0, -1.5, 0.7]]),
+        "water": (["O", "H", "H"], [[0.0, 0.0, 0.1173], [0.0, 0.7572, -0.4692], [0.0, -0.7572, -0.4692]]),
+    }
+
+    def test_rotated_copy_is_restored(self):
+        for name, (symbols, coords) in self.molecules.items():
+            reference = molecular.Molecule.from_array(symbols, np.array(coords))
+            center = reference.get_mass_center()
+            for seed in range(20):
+                with self.subTest(molecule=name, seed=seed):
+                    copy = molecular.Molecule.from_array(symbols, (reference._coords - center)
+                                                         @ random_rotation(seed).T + center)
+                    copy.match_rotation_to(reference)
+                    np.testing.assert_allclose(copy._coords, reference._coords, atol=1e-6)
+
+
+class GaussianLink101Test(unittest.TestCase):
+
+    def test_input_geometry_is_read(self):
+        gaussian = molecular.GaussianFile()
+        gaussian.read(os.path.join(DATA, "l101.log"))
+        self.assertEqual(gaussian.calculation_title, "Formaldehyde opt test")
+        self.assertEqual(len(gaussian.geometries), 1)
+        geometry = gaussian.geometries[0]
+        self.assertEqual(list(geometry._symbols), ["C", "O", "H", "H"])
+        np.testing.assert_allclose(geometry._coords, [[-0.53, 0.0, 0.0], [0.67, 0.0, 0.0],
+                                                      [-1.1, 0.93, 0.0], [-1.1, -0.93, 0.0]])
+
+
+if __name__ == "__main__":
+    unittest.main()